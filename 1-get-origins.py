@@ -3,6 +3,12 @@ import json
 import os
 from collections import defaultdict
 
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
 def process_jsonl(input_path, language_code):
     unique_genders = set()
     unique_countries = set()
@@ -11,10 +17,10 @@ def process_jsonl(input_path, language_code):
     processed = 0
     
     try:
-        with open(input_path, 'r', encoding='utf-8') as f:
+        with open(input_path, 'rb') as f:
             for line in f:
                 try:
-                    entry = json.loads(line)
+                    entry = loads(line)
                     
                     if entry.get('language') != language_code:
                         continue
@@ -34,8 +40,8 @@ def process_jsonl(input_path, language_code):
                     if processed % 100000 == 0:
                         print(f"Processed {processed:,} entries...")
                         
-                except json.JSONDecodeError:
-                    print(f"Skipping invalid JSON line: {line.strip()}")
+                except ValueError:
+                    print(f"Skipping invalid JSON line: {line.decode('utf-8', 'replace').strip()}")
                 except Exception as e:
                     print(f"Error processing line: {e}")
     
@@ -51,10 +57,7 @@ def process_jsonl(input_path, language_code):
     output = {
         "unique_genders_origin": sorted(unique_genders),
         "unique_countries_origin": sorted(unique_countries),
-        "unique_combinations": sorted(
-            [[s, t] for s, t in unique_combinations],
-            key=lambda x: (x[0], x[1])
-        )
+        "unique_combinations": [[s, t] for s, t in sorted(unique_combinations)]
     }
     
     base_name = os.path.splitext(os.path.basename(input_path))[0]
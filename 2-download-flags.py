@@ -1,50 +1,70 @@
+import http.client
 import json
 import os
-import urllib.request
-from urllib.error import HTTPError, URLError
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import argparse
 import unicodedata
+from functools import lru_cache
 
+FLAG_HOST = 'hatscripts.github.io'
+MAX_WORKERS = 16
+
+_thread_local = threading.local()
+
+def get_connection():
+    conn = getattr(_thread_local, 'conn', None)
+    if conn is None:
+        conn = http.client.HTTPSConnection(FLAG_HOST, timeout=30)
+        _thread_local.conn = conn
+    return conn
+
+@lru_cache(maxsize=4096)
 def normalize_country_name(name):
-    return unicodedata.normalize('NFKD', name.strip().lower()).encode('ascii', 'ignore').decode('ascii')
+    s = name.strip().lower()
+    if s.isascii():
+        return s
+    return unicodedata.normalize('NFKD', s).encode('ascii', 'ignore').decode('ascii')
 
 def build_country_mapping(countries_data):
     country_mapping = {}
+    normalize = normalize_country_name
+
     for country in countries_data:
         code = country.get('cca2', country.get('cca3', None))
         if not code:
             continue
-        
-        common_name = normalize_country_name(country['name']['common'])
-        country_mapping[common_name] = code
-        
-        official_name = normalize_country_name(country['name']['official'])
-        country_mapping[official_name] = code
-        
-        for alt in country.get('altSpellings', []):
-            alt_name = normalize_country_name(alt)
-            country_mapping[alt_name] = code
-            
-        for lang, trans in country.get('translations', {}).items():
-            trans_common = normalize_country_name(trans.get('common', ''))
-            if trans_common:
-                country_mapping[trans_common] = code
-            trans_official = normalize_country_name(trans.get('official', ''))
-            if trans_official:
-                country_mapping[trans_official] = code
-    
+
+        names = [country['name']['common'], country['name']['official']]
+        names.extend(country.get('altSpellings', []))
+        for trans in country.get('translations', {}).values():
+            names.append(trans.get('common', ''))
+            names.append(trans.get('official', ''))
+
+        country_mapping.update((normalize(name), code) for name in names if name)
+
     return country_mapping
 
 def download_flag(code, flags_dir='flags'):
-    os.makedirs(flags_dir, exist_ok=True)
     filename = f"{code}.svg"
     filepath = os.path.join(flags_dir, filename)
-    url = f"https://hatscripts.github.io/circle-flags/flags/{code.lower()}.svg"
-    
+    conn = get_connection()
+
     try:
-        urllib.request.urlretrieve(url, filepath)
+        conn.request('GET', f"/circle-flags/flags/{code.lower()}.svg")
+        response = conn.getresponse()
+        body = response.read()
+        if response.status != 200:
+            return None, f"HTTP Error {response.status}: {response.reason}"
+        fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, body)
+        finally:
+            os.close(fd)
         return filename, None
-    except (HTTPError, URLError) as e:
+    except (http.client.HTTPException, OSError) as e:
+        _thread_local.conn = None
+        conn.close()
         return None, str(e)
 
 def main():
@@ -63,12 +83,24 @@ def main():
     
     country_mapping = build_country_mapping(countries_data)
     
+    codes = {country_mapping[normalize_country_name(c)]
+             for c in countries_list
+             if normalize_country_name(c) in country_mapping}
+
+    os.makedirs('flags', exist_ok=True)
+
+    downloads = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(download_flag, code): code for code in codes}
+        for future in as_completed(futures):
+            downloads[futures[future]] = future.result()
+
     results = []
     for country in countries_list:
         normalized = normalize_country_name(country)
         if normalized in country_mapping:
             code = country_mapping[normalized]
-            flag_file, error = download_flag(code)
+            flag_file, error = downloads[code]
             result = {
                 'original_name': country,
                 'normalized_name': normalized,
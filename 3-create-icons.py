@@ -1,9 +1,26 @@
 import os
 import json
 import re
-from xml.etree import ElementTree as ET
+try:
+    from lxml import etree as ET
+except ImportError:
+    from xml.etree import ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 import argparse
-import copy
+
+_gender_inner = {}
+
+def serialize_children(svg_xml):
+    return b''.join(ET.tostring(child) for child in ET.fromstring(svg_xml))
+
+def init_worker(venus_xml, mars_xml):
+    _gender_inner['female'] = serialize_children(venus_xml)
+    _gender_inner['male'] = serialize_children(mars_xml)
+
+def create_icon_task(task):
+    gender_key, flag_path, output_path, filename = task
+    gender_inner = _gender_inner.get(gender_key) if gender_key else None
+    return filename, create_composite_icon(flag_path, gender_inner, output_path)
 
 def load_country_mappings(mapping_file):
     with open(mapping_file, 'r') as f:
@@ -11,43 +28,54 @@ def load_country_mappings(mapping_file):
     
     return {m['original_name'].lower(): m for m in mappings}
 
-def create_composite_icon(flag_path, gender_icon, output_path, position_offset=5):
+SVG_OPEN_TAG = re.compile(rb'<svg\b[^>]*>')
+
+def get_svg_attr(open_tag, name):
+    m = re.search(rb'\b' + name + rb'="([^"]*)"', open_tag)
+    return m.group(1).decode('utf-8') if m else None
+
+def create_composite_icon(flag_path, gender_inner, output_path, position_offset=5):
     try:
-        flag_tree = ET.parse(flag_path)
-        flag_root = flag_tree.getroot()
-        
-        flag_width = float(flag_root.get('width', 24))
-        flag_height = float(flag_root.get('height', 24))
-        flag_viewbox = flag_root.get('viewBox', f'0 0 {flag_width} {flag_height}').split()
-        
-        vb_x, vb_y, vb_width, vb_height = map(float, flag_viewbox)
-        
+        with open(flag_path, 'rb') as f:
+            flag_bytes = f.read()
+
+        m = SVG_OPEN_TAG.search(flag_bytes)
+        end = flag_bytes.rfind(b'</svg>')
+        if not m or end < m.end():
+            raise ValueError("no <svg> element found")
+
+        open_tag = m.group(0)
+        flag_inner = flag_bytes[m.end():end]
+
+        flag_width = float(get_svg_attr(open_tag, b'width') or 24)
+        flag_height = float(get_svg_attr(open_tag, b'height') or 24)
+        flag_viewbox = get_svg_attr(open_tag, b'viewBox') or f'0 0 {flag_width} {flag_height}'
+
+        vb_x, vb_y, vb_width, vb_height = map(float, flag_viewbox.split())
+
         icon_size = min(vb_width, vb_height) / 4
-        
-        composite = ET.Element('svg', {
-            'xmlns': 'http://www.w3.org/2000/svg',
-            'width': str(flag_width),
-            'height': str(flag_height),
-            'viewBox': ' '.join(flag_viewbox)
-        })
-        
-        for child in flag_root:
-            composite.append(copy.deepcopy(child))
-        
-        if gender_icon:
+
+        overlay = b''
+        if gender_inner:
             x_pos = vb_x + vb_width - icon_size - position_offset
             y_pos = vb_y + vb_height - icon_size - position_offset
-            
-            gender_container = ET.SubElement(composite, 'g', {
-                'transform': f'translate({x_pos}, {y_pos}) scale({icon_size/512})'
-            })
-            
-            for elem in gender_icon:
-                new_elem = copy.deepcopy(elem)
-                gender_container.append(new_elem)
-        
-        tree = ET.ElementTree(composite)
-        tree.write(output_path, encoding='utf-8', xml_declaration=True)
+
+            overlay = (
+                f'<g transform="translate({x_pos}, {y_pos}) scale({icon_size/512})">'.encode('utf-8')
+                + gender_inner
+                + b'</g>'
+            )
+
+        final_bytes = (
+            b"<?xml version='1.0' encoding='utf-8'?>\n"
+            + open_tag + flag_inner + overlay + b'</svg>'
+        )
+
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, final_bytes)
+        finally:
+            os.close(fd)
         return True
     except Exception as e:
         print(f"Error creating {output_path}: {str(e)}")
@@ -91,52 +119,56 @@ def main():
     apply_colors_to_svg(venus_root, '#FF69B4')
     apply_colors_to_svg(mars_root, '#1E90FF')
     
-    venus_children = list(venus_root)
-    mars_children = list(mars_root)
-    
     country_mappings = load_country_mappings(args.mapping_file)
-    
+
     with open(args.input_file, 'r') as f:
         data = json.load(f)
         combinations = data['unique_combinations']
-    
-    success_count = 0
+
+    tasks = []
     for gender, country in combinations:
         country_lower = country.lower()
-        
+
         if country_lower not in country_mappings:
             print(f"Country not mapped: {country} - Skipping")
             continue
-            
+
         mapping = country_mappings[country_lower]
-        
+
         if not mapping.get('flag_file'):
             print(f"No flag file for: {country} - Skipping")
             continue
-            
+
         gender_safe = gender.lower().replace(' ', '_') if gender else ''
         country_safe = mapping['iso_code']
         if gender_safe:
             filename = f"{gender_safe}_{country_safe}.svg"
         else:
             filename = f"_{country_safe}.svg"
-        
+
         output_path = os.path.join(args.output, filename)
         flag_path = os.path.join(args.flags_dir, mapping['flag_file'])
-        
+
         if not os.path.exists(flag_path):
             print(f"Flag file missing: {flag_path} - Skipping")
             continue
-        
-        gender_svg = None
+
+        gender_key = None
         if gender and 'female' in gender.lower():
-            gender_svg = venus_children
+            gender_key = 'female'
         elif gender and 'male' in gender.lower():
-            gender_svg = mars_children
-        
-        if create_composite_icon(flag_path, gender_svg, output_path):
-            success_count += 1
-            print(f"Created: {filename}")
+            gender_key = 'male'
+
+        tasks.append((gender_key, flag_path, output_path, filename))
+
+    success_count = 0
+    with ProcessPoolExecutor(max_workers=os.cpu_count(),
+                             initializer=init_worker,
+                             initargs=(ET.tostring(venus_root), ET.tostring(mars_root))) as executor:
+        for filename, created in executor.map(create_icon_task, tasks, chunksize=64):
+            if created:
+                success_count += 1
+                print(f"Created: {filename}")
 
     print(f"\nSuccessfully created {success_count} out of {len(combinations)} icons")
 
@@ -6,16 +6,90 @@ import signal
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
+from itertools import groupby
+from functools import lru_cache
 import argparse
 from urllib.parse import unquote
 
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+STYLESHEET_NAME = 'forvo.css'
+
+PRONUNCIATION_CSS = '''.audio-pronunciations {
+    display: flex;
+    flex-wrap: wrap;
+    gap: 5px;
+    align-items: center;
+}
+.pronunciation-item {
+    display: inline-flex;
+    align-items: center;
+    gap: 2px;
+}
+.pronunciation-item a {
+    text-decoration: none;
+    border: none;
+    display: inline-block;
+}
+.pronunciation-icon {
+    width: 24px;
+    height: 24px;
+    margin: 2px;
+    border: none;
+}
+.pronunciation-icon:hover {
+    opacity: 0.7;
+    transform: scale(1.1);
+    transition: all 0.2s ease;
+}
+.vote-count {
+    font-size: 0.8em;
+    color: #666;
+    margin-left: 2px;
+}
+'''
+
+HTML_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+HTML_HEAD = (
+    f'<link rel="stylesheet" type="text/css" href="{STYLESHEET_NAME}">'
+    '<div class="audio-pronunciations">'
+)
+
+ITEM_TEMPLATE = (
+    '<div class="pronunciation-item">'
+    '<a href="sound://{file_path}" title="{title}">'
+    '<img src="{icon}" alt="{username}" class="pronunciation-icon">'
+    '</a>{votes}</div>'
+)
+
+
+class AudioRecord:
+    __slots__ = ('username', 'gender', 'country', 'votes', 'file_path', 'download_url', 'audio_id')
+
+    def __init__(self, username, gender, country, votes, file_path, download_url, audio_id):
+        self.username = username
+        self.gender = gender
+        self.country = country
+        self.votes = votes
+        self.file_path = file_path
+        self.download_url = download_url
+        self.audio_id = audio_id
+
 
 class ForvoProcessor:
+    BATCH_SIZE = 10000
+    AUDIO_EXTENSIONS = ('.opus', '.mp3', '.ogg')
+
     def __init__(self, root_dir: str, db_path: str = "forvo_database.db", simple_db_path: str = "forvo_simple.db"):
         self.root_dir = Path(root_dir)
         self.db_path = db_path
         self.simple_db_path = simple_db_path
+        self.staging_db_path = f"{db_path}.staging"
         self.audio_dir = self.root_dir
         self.metadata_file = self.root_dir / "metadata.jsonl"
         self.icons_dir = self.root_dir / "icons"
@@ -25,8 +99,16 @@ class ForvoProcessor:
         
         self.country_mappings = self.load_country_mappings()
         
+        self.audio_index = {}
+        self.icons_set = set()
+        self.icon_for = {}
+
+        self.unquote = lru_cache(maxsize=65536)(unquote)
+        self._country_key_cache = {}
+
         self.conn = None
         self.simple_conn = None
+        self.staging_conn = None
         
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
@@ -51,6 +133,8 @@ class ForvoProcessor:
             self.conn.close()
         if self.simple_conn:
             self.simple_conn.close()
+        if self.staging_conn:
+            self.staging_conn.close()
         sys.exit(0)
     
     def load_country_mappings(self) -> Dict[str, Dict]:
@@ -60,7 +144,7 @@ class ForvoProcessor:
             
             country_lookup = {}
             for mapping in mappings:
-                country_lookup[mapping['original_name'].lower()] = mapping
+                country_lookup[sys.intern(mapping['original_name'].lower())] = mapping
             
             self.logger.info(f"Loaded {len(country_lookup)} country mappings")
             return country_lookup
@@ -72,9 +156,19 @@ class ForvoProcessor:
             self.logger.error(f"Error parsing country mappings: {e}")
             return {}
     
+    def apply_performance_pragmas(self, conn):
+        conn.execute('PRAGMA page_size=8192')
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-262144')
+        conn.execute('PRAGMA mmap_size=268435456')
+
     def init_databases(self):
         try:
             self.conn = sqlite3.connect(self.db_path)
+            self.conn.isolation_level = None
+            self.apply_performance_pragmas(self.conn)
             cursor = self.conn.cursor()
             
             cursor.execute('''
@@ -104,14 +198,12 @@ class ForvoProcessor:
                 )
             ''')
             
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_words_language_headword ON words(language, headword)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_audio_word_id ON audio_files(word_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_audio_votes ON audio_files(votes DESC)')
-            
             self.conn.commit()
             self.logger.info("Complex database initialized successfully")
-            
+
             self.simple_conn = sqlite3.connect(self.simple_db_path)
+            self.simple_conn.isolation_level = None
+            self.apply_performance_pragmas(self.simple_conn)
             simple_cursor = self.simple_conn.cursor()
             
             simple_cursor.execute('''
@@ -126,131 +218,164 @@ class ForvoProcessor:
                 )
             ''')
             
-            simple_cursor.execute('CREATE INDEX IF NOT EXISTS idx_mdx_entry ON mdx(entry)')
-            simple_cursor.execute('CREATE INDEX IF NOT EXISTS idx_mdx_language ON mdx(language)')
-            simple_cursor.execute('CREATE INDEX IF NOT EXISTS idx_mdx_entry_language ON mdx(entry, language)')
-            
             self.simple_conn.commit()
             self.logger.info("Simple database (MDX format) initialized successfully")
-            
+
         except sqlite3.Error as e:
             self.logger.error(f"Database initialization error: {e}")
             raise
+
+    def create_indexes(self):
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_words_language_headword ON words(language, headword)')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_audio_word_id ON audio_files(word_id)')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_audio_votes ON audio_files(votes DESC)')
+
+        self.simple_conn.execute('CREATE INDEX IF NOT EXISTS idx_mdx_entry ON mdx(entry)')
+        self.simple_conn.execute('CREATE INDEX IF NOT EXISTS idx_mdx_language ON mdx(language)')
+        self.simple_conn.execute('CREATE INDEX IF NOT EXISTS idx_mdx_entry_language ON mdx(entry, language)')
+
+        self.logger.info("Secondary indexes created")
     
+    def build_file_indexes(self):
+        file_count = 0
+        for lang_entry in os.scandir(self.audio_dir):
+            if not lang_entry.is_dir() or lang_entry.name.startswith('.'):
+                continue
+            for user_entry in os.scandir(lang_entry.path):
+                if not user_entry.is_dir():
+                    continue
+                files = {}
+                for f in os.scandir(user_entry.path):
+                    stem, ext = os.path.splitext(f.name)
+                    ext = ext.lower()
+                    if ext not in self.AUDIO_EXTENSIONS:
+                        continue
+                    existing = files.get(stem)
+                    if existing is None or self.AUDIO_EXTENSIONS.index(ext) < self.AUDIO_EXTENSIONS.index(os.path.splitext(existing)[1].lower()):
+                        files[stem] = f.name
+                        file_count += 1
+                if files:
+                    self.audio_index[(lang_entry.name, user_entry.name)] = files
+
+        self.icons_set = {e.name for e in os.scandir(self.icons_dir)}
+
+        for name in self.icons_set:
+            if not name.endswith('.svg'):
+                continue
+            stem = name[:-4]
+            if stem.startswith('_'):
+                self.icon_for[('', stem[1:])] = f"icons/{name}"
+            elif '_' in stem:
+                gender, iso_code = stem.split('_', 1)
+                self.icon_for[(gender, iso_code)] = f"icons/{name}"
+            else:
+                self.icon_for.setdefault(('', stem), f"icons/{name}")
+
+        self.logger.info(f"Indexed {file_count} audio files and {len(self.icons_set)} icons")
+
     def get_icon_path(self, gender: str, country: str) -> Optional[str]:
-        gender_prefix = ""
+        gender_key = ""
         if gender and gender.lower() in ['male', 'female']:
-            gender_prefix = f"{gender.lower()}_"
-        
-        country_info = self.country_mappings.get(country.lower())
+            gender_key = gender.lower()
+
+        country_key = self._country_key_cache.get(country)
+        if country_key is None:
+            country_key = self._country_key_cache[country] = sys.intern(country.lower())
+
+        country_info = self.country_mappings.get(country_key)
         if not country_info:
             self.logger.debug(f"Country mapping not found for: {country}")
             return None
-        
+
         iso_code = country_info['iso_code']
-        
-        icon_patterns = [
-            f"{gender_prefix}{iso_code}.svg",
-            f"_{iso_code}.svg",
-            f"{iso_code}.svg"
-        ]
-        
-        for pattern in icon_patterns:
-            icon_path = self.icons_dir / pattern
-            if icon_path.exists():
-                return f"icons/{pattern}"
-        
-        self.logger.debug(f"Icon not found for {gender}_{country} (ISO: {iso_code})")
-        return None
+
+        icon_path = self.icon_for.get((gender_key, iso_code))
+        if icon_path is None and gender_key:
+            icon_path = self.icon_for.get(('', iso_code))
+
+        if icon_path is None:
+            self.logger.debug(f"Icon not found for {gender}_{country} (ISO: {iso_code})")
+
+        return icon_path
     
     def check_audio_file_exists(self, language: str, username: str, headword: str) -> Optional[str]:
-        extensions = ['.opus', '.mp3', '.ogg']
-        
-        for ext in extensions:
-            audio_path = self.audio_dir / language / username / f"{headword}{ext}"
-            if audio_path.exists():
-                return f"{language}/{username}/{headword}{ext}"
-        
-        return None
+        files = self.audio_index.get((language, username))
+        if not files:
+            return None
+
+        filename = files.get(headword)
+        if filename is None:
+            return None
+
+        return f"{language}/{username}/{filename}"
     
-    def generate_html_content(self, audio_data: List[Dict]) -> str:
-        html_parts = ['<div class="audio-pronunciations">']
-        
-        sorted_audio = sorted(audio_data, key=lambda x: x.get('votes', 0), reverse=True)
-        
-        for audio in sorted_audio:
-            username = audio.get('username', 'unknown')
-            gender = audio.get('gender', '')
-            country = audio.get('country', '')
-            votes = audio.get('votes', 0)
-            file_path = audio.get('file_path', '')
-            
+    def write_stylesheet(self):
+        stylesheet_path = self.root_dir / STYLESHEET_NAME
+        with open(stylesheet_path, 'w', encoding='utf-8') as f:
+            f.write(PRONUNCIATION_CSS)
+        self.logger.info(f"Stylesheet written to {stylesheet_path}")
+
+    def generate_html_content(self, audio_data: List[AudioRecord]) -> str:
+        html_parts = [HTML_HEAD]
+
+        for audio in audio_data:
+            username = audio.username or 'unknown'
+            gender = audio.gender
+            country = audio.country
+            votes = audio.votes
+            file_path = audio.file_path
+
             icon_path = self.get_icon_path(gender, country)
             if not icon_path:
                 self.logger.debug(f"No icon found for {username} ({gender}, {country})")
                 continue
-            
+
             title_text = f"{username} ({country})"
             if votes > 0:
                 title_text += f" - {votes} votes"
-            
-            audio_html = f'''
-            <div class="pronunciation-item">
-                <a href="sound://{file_path}" title="{title_text}">
-                    <img src="{icon_path}" 
-                         alt="{username}" 
-                         class="pronunciation-icon" 
-                         style="width: 24px; height: 24px; margin: 2px; border: none;">
-                </a>
-                {f'<span class="vote-count">({votes})</span>' if votes > 0 else ''}
-            </div>'''
-            
-            html_parts.append(audio_html)
-        
-        if html_parts[1:]:
-            html_parts.append('''
-            <style>
-            .audio-pronunciations {
-                display: flex;
-                flex-wrap: wrap;
-                gap: 5px;
-                align-items: center;
-            }
-            .pronunciation-item {
-                display: inline-flex;
-                align-items: center;
-                gap: 2px;
-            }
-            .pronunciation-item a {
-                text-decoration: none;
-                border: none;
-                display: inline-block;
-            }
-            .pronunciation-icon:hover {
-                opacity: 0.7;
-                transform: scale(1.1);
-                transition: all 0.2s ease;
-            }
-            .vote-count {
-                font-size: 0.8em;
-                color: #666;
-                margin-left: 2px;
-            }
-            </style>''')
-        
+
+            html_parts.append(ITEM_TEMPLATE.format(
+                file_path=file_path,
+                title=title_text.translate(HTML_ESCAPES),
+                icon=icon_path,
+                username=username.translate(HTML_ESCAPES),
+                votes=f'<span class="vote-count">({votes})</span>' if votes > 0 else ''
+            ))
+
         html_parts.append('</div>')
         return ''.join(html_parts)
     
-    def process_metadata(self):
-        if not self.metadata_file.exists():
-            raise FileNotFoundError(f"Metadata file not found: {self.metadata_file}")
-        
-        self.logger.info("Starting metadata processing...")
-        
-        word_audio_map = defaultdict(list)
-        
+    def build_staging(self):
+        if os.path.exists(self.staging_db_path):
+            os.remove(self.staging_db_path)
+
+        self.staging_conn = sqlite3.connect(self.staging_db_path)
+        self.staging_conn.isolation_level = None
+        self.staging_conn.execute('PRAGMA page_size=8192')
+        self.staging_conn.execute('PRAGMA journal_mode=OFF')
+        self.staging_conn.execute('PRAGMA synchronous=OFF')
+        self.staging_conn.execute('PRAGMA temp_store=MEMORY')
+        self.staging_conn.execute('PRAGMA cache_size=-262144')
+        self.staging_conn.execute('PRAGMA mmap_size=268435456')
+        self.staging_conn.execute('''
+            CREATE TABLE staging (
+                language TEXT NOT NULL,
+                headword TEXT NOT NULL,
+                username TEXT,
+                gender TEXT,
+                country TEXT,
+                votes INTEGER DEFAULT 0,
+                file_path TEXT,
+                download_url TEXT,
+                audio_id INTEGER
+            )
+        ''')
+
+        staging_rows = []
+        self.staging_conn.execute('BEGIN')
+
         try:
-            with open(self.metadata_file, 'r', encoding='utf-8') as f:
+            with open(self.metadata_file, 'rb') as f:
                 line_count = 0
                 processed_count = 0
                 
@@ -263,7 +388,7 @@ class ForvoProcessor:
                         self.logger.info(f"Processed {line_count} metadata entries...")
                     
                     try:
-                        entry = json.loads(line.strip())
+                        entry = json_loads(line)
                         
                         language = entry.get('language', '')
                         headword = entry.get('headword', '')
@@ -273,7 +398,7 @@ class ForvoProcessor:
                         
                         query_word = entry.get('query_word', headword)
                         if query_word != headword:
-                            headword = unquote(query_word)
+                            headword = self.unquote(query_word)
                         
                         origin = entry.get('origin', [])
                         if len(origin) >= 3:
@@ -292,20 +417,18 @@ class ForvoProcessor:
                             self.logger.debug(f"Audio file not found for {language}/{username}/{headword}")
                             continue
                         
-                        key = (language, headword)
-                        word_audio_map[key].append({
-                            'username': username,
-                            'gender': gender,
-                            'country': country,
-                            'votes': votes,
-                            'file_path': file_path,
-                            'download_url': download_url,
-                            'audio_id': audio_id
-                        })
-                        
+                        staging_rows.append((language, headword, username, gender, country, votes, file_path, download_url, audio_id))
+                        if len(staging_rows) >= self.BATCH_SIZE:
+                            self.staging_conn.executemany('''
+                                INSERT INTO staging
+                                (language, headword, username, gender, country, votes, file_path, download_url, audio_id)
+                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            ''', staging_rows)
+                            staging_rows.clear()
+
                         processed_count += 1
                         
-                    except json.JSONDecodeError as e:
+                    except ValueError as e:
                         self.logger.warning(f"Error parsing JSON on line {line_count}: {e}")
                         continue
                     except Exception as e:
@@ -317,63 +440,117 @@ class ForvoProcessor:
         except Exception as e:
             self.logger.error(f"Error reading metadata file: {e}")
             raise
-        
-        self.logger.info(f"Creating database entries for {len(word_audio_map)} unique words...")
-        
-        cursor = self.conn.cursor()
-        simple_cursor = self.simple_conn.cursor()
+
+        if staging_rows:
+            self.staging_conn.executemany('''
+                INSERT INTO staging
+                (language, headword, username, gender, country, votes, file_path, download_url, audio_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', staging_rows)
+            staging_rows.clear()
+
+        self.staging_conn.execute('COMMIT')
+        self.staging_conn.execute('CREATE INDEX idx_staging_key ON staging(language, headword)')
+
+    def insert_word(self, language, headword, audio_list, audio_rows, mdx_rows):
+        try:
+            audio_list.sort(key=lambda x: x.votes, reverse=True)
+            html_content = self.generate_html_content(audio_list)
+
+            word_id = self.conn.execute('''
+                INSERT OR REPLACE INTO words (language, headword, html_content, audio_count)
+                VALUES (?, ?, ?, ?)
+            ''', (language, headword, html_content, len(audio_list))).lastrowid
+
+            for audio in audio_list:
+                audio_rows.append((
+                    word_id,
+                    audio.username,
+                    audio.gender,
+                    audio.country,
+                    audio.votes,
+                    audio.file_path,
+                    audio.download_url,
+                    audio.audio_id
+                ))
+
+            mdx_rows.append((headword, html_content, language, len(audio_list)))
+
+            return True
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error for {language}/{headword}: {e}")
+            return False
+        except Exception as e:
+            self.logger.error(f"Error processing {language}/{headword}: {e}")
+            return False
+
+    def process_metadata(self):
+        if not self.metadata_file.exists():
+            raise FileNotFoundError(f"Metadata file not found: {self.metadata_file}")
+
+        self.logger.info("Starting metadata processing...")
+
+        self.build_staging()
+
+        self.logger.info("Creating database entries from staged audio records...")
+
         word_count = 0
-        
-        for (language, headword), audio_list in word_audio_map.items():
-            if self.interrupted:
-                break
-            
-            try:
-                html_content = self.generate_html_content(audio_list)
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO words (language, headword, html_content, audio_count)
-                    VALUES (?, ?, ?, ?)
-                ''', (language, headword, html_content, len(audio_list)))
-                
-                word_id = cursor.lastrowid
-                
-                for audio in audio_list:
-                    cursor.execute('''
-                        INSERT INTO audio_files 
-                        (word_id, username, gender, country, votes, file_path, download_url, audio_id)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        word_id,
-                        audio['username'],
-                        audio['gender'],
-                        audio['country'],
-                        audio['votes'],
-                        audio['file_path'],
-                        audio['download_url'],
-                        audio['audio_id']
-                    ))
-                
-                simple_cursor.execute('''
+
+        read_cursor = self.staging_conn.execute('''
+            SELECT language, headword, username, gender, country, votes, file_path, download_url, audio_id
+            FROM staging ORDER BY language, headword
+        ''')
+
+        audio_rows = []
+        mdx_rows = []
+
+        def flush_batches():
+            if audio_rows:
+                self.conn.executemany('''
+                    INSERT INTO audio_files
+                    (word_id, username, gender, country, votes, file_path, download_url, audio_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', audio_rows)
+                audio_rows.clear()
+            if mdx_rows:
+                self.simple_conn.executemany('''
                     INSERT OR REPLACE INTO mdx (entry, paraphrase, language, audio_count)
                     VALUES (?, ?, ?, ?)
-                ''', (headword, html_content, language, len(audio_list)))
-                
+                ''', mdx_rows)
+                mdx_rows.clear()
+
+        def flush(key, audios):
+            nonlocal word_count
+            if self.insert_word(key[0], key[1], audios, audio_rows, mdx_rows):
                 word_count += 1
+                if len(audio_rows) >= self.BATCH_SIZE:
+                    flush_batches()
                 if word_count % 1000 == 0:
-                    self.conn.commit()
-                    self.simple_conn.commit()
                     self.logger.info(f"Processed {word_count} words...")
-                
-            except sqlite3.Error as e:
-                self.logger.error(f"Database error for {language}/{headword}: {e}")
-                continue
-            except Exception as e:
-                self.logger.error(f"Error processing {language}/{headword}: {e}")
-                continue
-        
-        self.conn.commit()
-        self.simple_conn.commit()
+
+        self.conn.execute('BEGIN')
+        self.simple_conn.execute('BEGIN')
+
+        for key, group in groupby(read_cursor, key=lambda row: (row[0], row[1])):
+            if self.interrupted:
+                break
+
+            audio_list = [AudioRecord(*row[2:]) for row in group]
+
+            flush(key, audio_list)
+
+        flush_batches()
+
+        self.conn.execute('COMMIT')
+        self.simple_conn.execute('COMMIT')
+
+        self.create_indexes()
+
+        self.staging_conn.close()
+        self.staging_conn = None
+        os.remove(self.staging_db_path)
+
         self.logger.info(f"Successfully processed {word_count} words")
     
     def run(self):
@@ -389,8 +566,12 @@ class ForvoProcessor:
             if not self.icons_dir.exists():
                 raise FileNotFoundError(f"Icons directory not found: {self.icons_dir}")
             
+            self.build_file_indexes()
+
+            self.write_stylesheet()
+
             self.init_databases()
-            
+
             self.process_metadata()
             
             if not self.interrupted:
@@ -423,6 +604,8 @@ class ForvoProcessor:
                 self.conn.close()
             if self.simple_conn:
                 self.simple_conn.close()
+            if self.staging_conn:
+                self.staging_conn.close()
 
 
 def main():
@@ -0,0 +1,121 @@
+import sys
+from pathlib import Path
+
+TITLE_PREFIX = b"Forvo "
+DESC_PREFIX = b"All Forvo "
+DESC_SUFFIX = b" audios uploaded until 2021.<br>Converted with script by ImenaOphelia"
+
+def get_json_loads():
+    try:
+        import orjson
+        return orjson.loads
+    except ImportError:
+        pass
+    try:
+        import ujson
+        return ujson.loads
+    except ImportError:
+        import json
+        return json.loads
+
+def load_lang_map(mapping_file):
+    import pickle
+
+    cache_file = mapping_file.with_suffix('.pkl')
+    mtime = mapping_file.stat().st_mtime_ns
+
+    try:
+        with open(cache_file, 'rb') as f:
+            cached_mtime, lang_map = pickle.load(f)
+        if cached_mtime == mtime:
+            return lang_map
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        pass
+
+    lang_map = get_json_loads()(mapping_file.read_bytes())
+
+    try:
+        with open(cache_file, 'wb') as f:
+            pickle.dump((mtime, lang_map), f, protocol=5)
+    except OSError:
+        pass
+
+    return lang_map
+
+def lookup_language(mapping_file, code):
+    import re
+
+    try:
+        import languages_table
+    except ImportError:
+        languages_table = None
+
+    if languages_table is not None:
+        try:
+            if Path(languages_table.__file__).stat().st_mtime >= mapping_file.stat().st_mtime:
+                return languages_table.LANG.get(code)
+        except OSError:
+            pass
+
+    data = mapping_file.read_text(encoding='utf-8')
+    m = re.search(rf'"{re.escape(code)}"\s*:\s*"([^"\\]+)"', data)
+    if m:
+        return m.group(1)
+
+    return load_lang_map(mapping_file).get(code)
+
+def copy_from_cache(mapping_file, code):
+    import shutil
+
+    cache_dir = Path("cache") / code
+    cached_title = cache_dir / "title.html"
+    cached_description = cache_dir / "description.html"
+
+    try:
+        mapping_mtime = mapping_file.stat().st_mtime
+        if (cached_title.stat().st_mtime < mapping_mtime
+                or cached_description.stat().st_mtime < mapping_mtime):
+            return False
+        shutil.copyfile(cached_title, "title.html")
+        shutil.copyfile(cached_description, "description.html")
+        return True
+    except OSError:
+        return False
+
+def main():
+    try:
+        _, code = sys.argv
+    except ValueError:
+        print("Usage: python 5-title-description.py <language_code>")
+        sys.exit(1)
+    mapping_file = Path("languages.json")
+
+    if copy_from_cache(mapping_file, code):
+        print(f"Copied prebuilt title.html and description.html for '{code}' from cache.")
+        return
+
+    try:
+        language = lookup_language(mapping_file, code)
+    except FileNotFoundError:
+        print("Error: 'languages.json' file not found.")
+        sys.exit(1)
+    except ValueError:
+        print("Error: Invalid JSON format in 'languages.json'.")
+        sys.exit(1)
+    if not language:
+        print(f"Error: Language code '{code}' not found in the mapping.")
+        sys.exit(1)
+
+    lang_bytes = language.encode('utf-8')
+    title_bytes = TITLE_PREFIX + lang_bytes
+    description_bytes = DESC_PREFIX + lang_bytes + DESC_SUFFIX
+
+    Path("title.html").write_bytes(title_bytes)
+    Path("description.html").write_bytes(description_bytes)
+
+    print("Generated:")
+    print(f"  - title.html: {title_bytes.decode('utf-8')}")
+    print(f"  - description.html: {description_bytes.decode('utf-8')}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
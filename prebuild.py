@@ -0,0 +1,41 @@
+import json
+import sys
+from pathlib import Path
+
+CACHE_DIR = Path("cache")
+
+def render_title(language):
+    return f"Forvo {language}"
+
+def render_description(language):
+    return f"All Forvo {language} audios uploaded until 2021.<br>Converted with script by ImenaOphelia"
+
+def main():
+    mapping_file = Path("languages.json")
+
+    if not mapping_file.exists():
+        print("Error: 'languages.json' file not found.")
+        sys.exit(1)
+
+    try:
+        lang_map = json.loads(mapping_file.read_bytes())
+    except json.JSONDecodeError:
+        print("Error: Invalid JSON format in 'languages.json'.")
+        sys.exit(1)
+
+    for code, language in lang_map.items():
+        out_dir = CACHE_DIR / code
+        out_dir.mkdir(parents=True, exist_ok=True)
+        (out_dir / "title.html").write_text(render_title(language), encoding="utf-8")
+        (out_dir / "description.html").write_text(render_description(language), encoding="utf-8")
+
+    table_file = Path("languages_table.py")
+    with open(table_file, "w", encoding="utf-8") as f:
+        f.write("# Generated by prebuild.py from languages.json; do not edit.\n")
+        f.write(f"LANG = {lang_map!r}\n")
+
+    print(f"Prebuilt title/description pages for {len(lang_map)} language codes in '{CACHE_DIR}/'")
+    print(f"Wrote language lookup table to '{table_file}'")
+
+if __name__ == "__main__":
+    main()
@@ -189,6 +189,7 @@ mdict --title title.html --description description.html --encoding utf8 -a forvo
 New-Item -ItemType Directory -Name "data"
 Move-Item "$code/" "data/"
 Move-Item "icons/" "data/"
+Move-Item "forvo.css" "data/"
 mdict --title title.html --description description.html --encoding utf8 -a data forvo-$code.mdd
 "@
 } else {
@@ -197,6 +198,7 @@ mdict --title title.html --description description.html --encoding utf8 -a data
     New-Item -ItemType Directory -Name "data" -Force
     Move-Item "$code/" "data/" -Force
     Move-Item "icons/" "data/" -Force
+    Move-Item "forvo.css" "data/" -Force
     & mdict --title title.html --description description.html --encoding utf8 -a data "forvo-$code.mdd"
 }
 
@@ -167,6 +167,7 @@ if [[ "$DRY_RUN" == false ]]; then
     mkdir data
     mv "${code}"/ data/
     mv icons/ data/
+    mv forvo.css data/
     mdict --title title.html --description description.html --encoding utf8 -a data forvo-"${code}".mdd
 else
     dry 'mdict --db-txt "forvo_simple.db" \
@@ -174,6 +175,7 @@ else
     mkdir data \
     mv "${code}"/ data/ \
     mv icons/ data/ \
+    mv forvo.css data/ \
     mdict --title title.html --description description.html --encoding utf8 -a data forvo-"${code}".mdd'
 fi
 
@@ -0,0 +1,12 @@
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(["gen_title_desc.py"], language_level=3)
+except ImportError:
+    ext_modules = []
+
+setup(
+    name="forvo-to-mdx",
+    ext_modules=ext_modules,
+)